@@ -0,0 +1,737 @@
+import argparse
+import base64
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+import warnings
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+# Words used for synthetic titles; some of them hit categorize_videos keywords
+WORDS = (
+    "python tutorial javascript react docker kubernetes machine learning guitar "
+    "piano cooking recipe travel vlog review unboxing podcast interview history "
+    "science space physics chemistry math lecture workout yoga music live game "
+    "speedrun news finance investing crypto design photography beginner advanced"
+).split()
+
+
+def video_id(n: int) -> str:
+    """A valid, unique 11 character YouTube ID for the integer n"""
+    return base64.urlsafe_b64encode(n.to_bytes(8, "big")).decode("ascii")[:11]
+
+
+def watch_url(n: int) -> str:
+    return f"https://www.youtube.com/watch?v={video_id(n)}"
+
+
+def synthetic_video(rng: random.Random, n: int) -> Dict:
+    vid = video_id(n)
+    return {
+        "title": " ".join(rng.choices(WORDS, k=rng.randint(3, 8))).title(),
+        "url": f"https://www.youtube.com/watch?v={vid}",
+        "watched": rng.random() < 0.3,
+        "description": " ".join(rng.choices(WORDS, k=20)),
+        "duration": rng.randint(30, 3 * 3600),
+        "thumbnail": f"https://i.ytimg.com/vi/{vid}/hqdefault.jpg",
+        "view_count": rng.randint(0, 10_000_000),
+        "upload_date": f"{rng.randint(2006, 2025)}{rng.randint(1, 12):02d}"
+        f"{rng.randint(1, 28):02d}",
+        "channel": f"Channel {rng.randint(1, 500)}",
+    }
+
+
+def generate_library(size: int, categories: int, seed: int = 0) -> Dict:
+    """Return a {category: [video]} library of `size` videos"""
+    rng = random.Random(seed)
+    names = [f"Category {i}" for i in range(categories)]
+    data = {name: [] for name in names}
+    for n in range(size):
+        data[names[n % categories]].append(synthetic_video(rng, n))
+    return data
+
+
+class StubYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL that answers after LATENCY seconds"""
+
+    LATENCY = 0.05
+    PLAYLIST_SIZE = 20
+
+    def __init__(self, opts: Optional[Dict] = None):
+        self.opts = opts or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url: str, download: bool = False) -> Dict:
+        time.sleep(self.LATENCY)
+        if "list=" in url:
+            return {
+                "entries": [
+                    {"id": video_id(2**40 + i), "title": f"Playlist video {i}"}
+                    for i in range(self.PLAYLIST_SIZE)
+                ]
+            }
+        vid = url.rsplit("v=", 1)[-1]
+        return {
+            "id": vid,
+            "title": f"Fetched {vid} python tutorial",
+            "description": "A stubbed video",
+            "duration": 600,
+            "thumbnail": f"https://i.ytimg.com/vi/{vid}/hqdefault.jpg",
+            "view_count": 1000,
+            "upload_date": "20240101",
+            "uploader": "Stub Channel",
+        }
+
+
+def stub_thumbnail(url: str) -> Tuple[bytes, str]:
+    """Stand-in for thumbnails.fetch_url that answers after LATENCY seconds"""
+    time.sleep(StubYoutubeDL.LATENCY)
+    return b"\xff\xd8" + bytes(20 * 1024), "image/jpeg"
+
+
+def install_stub(latency: float, playlist_size: int):
+    """Point yt_dlp.YoutubeDL at the stub, whether or not yt-dlp is installed"""
+    try:
+        import yt_dlp
+    except ImportError:
+        yt_dlp = sys.modules["yt_dlp"] = types.ModuleType("yt_dlp")
+    StubYoutubeDL.LATENCY = latency
+    StubYoutubeDL.PLAYLIST_SIZE = playlist_size
+    yt_dlp.YoutubeDL = StubYoutubeDL
+
+
+class Scenario(NamedTuple):
+    name: str
+    # (context, iteration) -> (method, url, request kwargs)
+    request: Callable[[Dict, int], Tuple[str, str, Dict]]
+    # Untimed preparation run before each request
+    setup: Optional[Callable[[Dict, int], None]] = None
+    # Waits on the stubbed extractor, so it gets fewer iterations
+    slow: bool = False
+
+
+def _next_id(ctx: Dict) -> int:
+    ctx["next_id"] += 1
+    return ctx["next_id"]
+
+
+def _new_url(ctx: Dict) -> str:
+    return watch_url(_next_id(ctx))
+
+
+def _category(ctx: Dict, i: int) -> str:
+    return ctx["categories"][i % len(ctx["categories"])]
+
+
+def _sample(ctx: Dict, i: int) -> Tuple[str, str]:
+    return ctx["samples"][i % len(ctx["samples"])]
+
+
+def _add_pending(ctx: Dict, i: int):
+    url = _new_url(ctx)
+    ctx["client"].post(
+        f"/categories/{_category(ctx, i)}/videos",
+        json={"title": "To delete", "url": url},
+    )
+    ctx["pending_delete"] = url
+
+
+def _fetch_etag(ctx: Dict, i: int):
+    response = ctx["client"].get(f"/categories/{_category(ctx, i)}")
+    ctx["etag"] = response.headers["etag"]
+
+
+def _thumbnail_id(ctx: Dict, i: int) -> str:
+    return _sample(ctx, i)[1].rsplit("v=", 1)[-1]
+
+
+def _cache_thumbnail(ctx: Dict, i: int):
+    ctx["client"].get(f"/thumbnails/{_thumbnail_id(ctx, i)}")
+
+
+def _new_playlist(ctx: Dict, i: int):
+    # Untrack the one added last time so syncing every playlist stays cheap
+    if ctx.get("new_playlist"):
+        ctx["client"].delete(f"/playlists/tracked/{ctx['new_playlist']}")
+    ctx["new_playlist"] = f"PLbench{_next_id(ctx)}"
+
+
+def _track_pending(ctx: Dict, i: int):
+    ctx["pending_playlist"] = f"PLbench{_next_id(ctx)}"
+    ctx["client"].post(
+        "/playlists/tracked",
+        params={
+            "url": f"https://www.youtube.com/playlist?list={ctx['pending_playlist']}"
+        },
+    )
+
+
+def _submit_job(ctx: Dict, i: int):
+    response = ctx["client"].post(
+        f"/categories/{_category(ctx, i)}/videos/fetch",
+        params={"url": _new_url(ctx), "background": "true"},
+    )
+    ctx["pending_job"] = response.json()["job_id"]
+
+
+SCENARIOS = [
+    Scenario("GET /categories", lambda ctx, i: ("GET", "/categories", {})),
+    Scenario(
+        "GET /categories/{category}",
+        lambda ctx, i: ("GET", f"/categories/{_category(ctx, i)}", {}),
+    ),
+    Scenario(
+        "GET /categories/{category}?fields",
+        lambda ctx, i: (
+            "GET",
+            f"/categories/{_category(ctx, i)}",
+            {"params": {"fields": "title,url", "limit": 1000}},
+        ),
+    ),
+    Scenario(
+        "GET /categories/{category}?stream",
+        lambda ctx, i: (
+            "GET",
+            f"/categories/{_category(ctx, i)}",
+            {"params": {"stream": "true"}},
+        ),
+    ),
+    Scenario(
+        "GET /categories/{category} If-None-Match",
+        lambda ctx, i: (
+            "GET",
+            f"/categories/{_category(ctx, i)}",
+            {"headers": {"If-None-Match": ctx["etag"]}},
+        ),
+        setup=_fetch_etag,
+    ),
+    Scenario(
+        "GET /search",
+        lambda ctx, i: (
+            "GET",
+            "/search",
+            {"params": {"q": f"{WORDS[i % len(WORDS)]} {WORDS[(i * 7) % len(WORDS)]}"}},
+        ),
+    ),
+    Scenario("GET /stats", lambda ctx, i: ("GET", "/stats", {})),
+    Scenario(
+        "GET /stats?category",
+        lambda ctx, i: ("GET", "/stats", {"params": {"category": _category(ctx, i)}}),
+    ),
+    Scenario(
+        "GET /thumbnails/{video_id}",
+        lambda ctx, i: ("GET", f"/thumbnails/{_thumbnail_id(ctx, i)}", {}),
+        setup=_cache_thumbnail,
+    ),
+    Scenario(
+        "GET /thumbnails/{video_id} miss",
+        lambda ctx, i: ("GET", f"/thumbnails/{video_id(_next_id(ctx))}", {}),
+        slow=True,
+    ),
+    Scenario(
+        "GET /videos",
+        lambda ctx, i: ("GET", "/videos", {"params": {"url": _sample(ctx, i)[1]}}),
+    ),
+    Scenario(
+        "POST /categories/{category}/videos",
+        lambda ctx, i: (
+            "POST",
+            f"/categories/{_category(ctx, i)}/videos",
+            {"json": {"title": f"Added {i}", "url": _new_url(ctx)}},
+        ),
+    ),
+    Scenario(
+        "PUT /categories/{category}/videos",
+        lambda ctx, i: (
+            "PUT",
+            f"/categories/{_sample(ctx, i)[0]}/videos",
+            {
+                "params": {"url": _sample(ctx, i)[1]},
+                "json": {"title": f"Updated {i}", "url": _sample(ctx, i)[1]},
+            },
+        ),
+    ),
+    Scenario(
+        "PATCH /categories/{category}/videos/watched",
+        lambda ctx, i: (
+            "PATCH",
+            f"/categories/{_sample(ctx, i)[0]}/videos/watched",
+            {"params": {"url": _sample(ctx, i)[1]}},
+        ),
+    ),
+    Scenario(
+        "DELETE /categories/{category}/videos",
+        lambda ctx, i: (
+            "DELETE",
+            f"/categories/{_category(ctx, i)}/videos",
+            {"params": {"url": ctx["pending_delete"]}},
+        ),
+        setup=_add_pending,
+    ),
+    Scenario(
+        "POST /videos/bulk",
+        lambda ctx, i: (
+            "POST",
+            "/videos/bulk",
+            {
+                "json": {
+                    "operations": [
+                        {
+                            "op": "set_watched",
+                            "category": _sample(ctx, i + n)[0],
+                            "url": _sample(ctx, i + n)[1],
+                            "watched": i % 2 == 0,
+                        }
+                        for n in range(20)
+                    ]
+                }
+            },
+        ),
+    ),
+    Scenario(
+        "POST /videos/bulk?filter",
+        lambda ctx, i: (
+            "POST",
+            "/videos/bulk",
+            {
+                "json": {
+                    "filter": {
+                        "category": _category(ctx, i),
+                        "channel": f"Channel {i % 500 + 1}",
+                    },
+                    "action": {"op": "set_watched", "watched": True},
+                }
+            },
+        ),
+    ),
+    Scenario(
+        "POST /categorize",
+        lambda ctx, i: ("POST", "/categorize", {"json": {"titles": ctx["titles"]}}),
+    ),
+    Scenario("GET /cache/stats", lambda ctx, i: ("GET", "/cache/stats", {})),
+    Scenario("GET /metrics", lambda ctx, i: ("GET", "/metrics", {})),
+    Scenario("GET /debug/profiler", lambda ctx, i: ("GET", "/debug/profiler", {})),
+    Scenario(
+        "PUT /debug/profiler",
+        # Left disabled so the profiler doesn't slow down the other endpoints
+        lambda ctx, i: (
+            "PUT",
+            "/debug/profiler",
+            {"params": {"enabled": "false", "slow_threshold": 1.0}},
+        ),
+    ),
+    Scenario("GET /jobs", lambda ctx, i: ("GET", "/jobs", {})),
+    Scenario(
+        "GET /jobs/{job_id}",
+        lambda ctx, i: ("GET", f"/jobs/{ctx['job_id']}", {}),
+    ),
+    Scenario(
+        "GET /jobs/{job_id}/results",
+        lambda ctx, i: ("GET", f"/jobs/{ctx['job_id']}/results", {}),
+    ),
+    Scenario(
+        "POST /playlists/import/{category}",
+        lambda ctx, i: (
+            "POST",
+            f"/playlists/import/{_category(ctx, i)}",
+            {"params": {"filename": ctx["playlist_file"]}},
+        ),
+    ),
+    Scenario(
+        "GET /playlists/tracked", lambda ctx, i: ("GET", "/playlists/tracked", {})
+    ),
+    Scenario(
+        "GET /playlists/tracked/{playlist_id}",
+        lambda ctx, i: ("GET", f"/playlists/tracked/{ctx['tracked_playlist']}", {}),
+    ),
+    Scenario(
+        "POST /playlists/tracked",
+        lambda ctx, i: (
+            "POST",
+            "/playlists/tracked",
+            {
+                "params": {
+                    "url": "https://www.youtube.com/playlist?list="
+                    + ctx["new_playlist"],
+                    "category": _category(ctx, i),
+                }
+            },
+        ),
+        setup=_new_playlist,
+    ),
+    Scenario(
+        "DELETE /playlists/tracked/{playlist_id}",
+        lambda ctx, i: (
+            "DELETE",
+            f"/playlists/tracked/{ctx['pending_playlist']}",
+            {},
+        ),
+        setup=_track_pending,
+    ),
+    Scenario(
+        "POST /categories/{category}/videos/fetch",
+        lambda ctx, i: (
+            "POST",
+            f"/categories/{_category(ctx, i)}/videos/fetch",
+            {"params": {"url": _new_url(ctx)}},
+        ),
+        slow=True,
+    ),
+    Scenario(
+        "POST /videos/fetch",
+        lambda ctx, i: ("POST", "/videos/fetch", {"params": {"url": _new_url(ctx)}}),
+        slow=True,
+    ),
+    Scenario(
+        "POST /videos/batch",
+        lambda ctx, i: (
+            "POST",
+            "/videos/batch",
+            {
+                "json": {
+                    "items": [
+                        {"category": _category(ctx, i + n), "url": _new_url(ctx)}
+                        for n in range(20)
+                    ]
+                }
+            },
+        ),
+        slow=True,
+    ),
+    Scenario(
+        "POST /playlists/convert",
+        lambda ctx, i: (
+            "POST",
+            "/playlists/convert",
+            {
+                "params": {
+                    "playlist_url": f"https://www.youtube.com/playlist?list=PL{i}"
+                }
+            },
+        ),
+        slow=True,
+    ),
+    Scenario(
+        "POST /playlists/tracked/{playlist_id}/sync",
+        # Nothing changed since the first sync, so this measures the diff
+        lambda ctx, i: (
+            "POST",
+            f"/playlists/tracked/{ctx['tracked_playlist']}/sync",
+            {},
+        ),
+        slow=True,
+    ),
+    Scenario(
+        "POST /playlists/tracked/sync",
+        lambda ctx, i: ("POST", "/playlists/tracked/sync", {}),
+        slow=True,
+    ),
+    Scenario(
+        "DELETE /jobs/{job_id}",
+        lambda ctx, i: ("DELETE", f"/jobs/{ctx['pending_job']}", {}),
+        setup=_submit_job,
+        slow=True,
+    ),
+]
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+
+def run_scenario(
+    ctx: Dict, scenario: Scenario, iterations: int, memory_iterations: int
+):
+    client = ctx["client"]
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        if scenario.setup is not None:
+            scenario.setup(ctx, i)
+        method, url, kwargs = scenario.request(ctx, i)
+        t0 = time.perf_counter()
+        response = client.request(method, url, **kwargs)
+        latencies.append(time.perf_counter() - t0)
+        if response.status_code >= 400:
+            errors += 1
+    elapsed = time.perf_counter() - started
+
+    # Allocation peaks are measured on separate requests, as tracing slows
+    # everything down
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i in range(iterations, iterations + memory_iterations):
+        if scenario.setup is not None:
+            scenario.setup(ctx, i)
+        method, url, kwargs = scenario.request(ctx, i)
+        client.request(method, url, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "peak_memory_bytes": peak,
+    }
+
+
+def wait_for_job(client, job_id: str, timeout: float = 300):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if client.get(f"/jobs/{job_id}").json()["status"] in (
+            "completed",
+            "failed",
+            "cancelled",
+        ):
+            return
+        time.sleep(0.01)
+    raise RuntimeError(f"Job {job_id} did not finish")
+
+
+def max_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def run_size(args) -> Dict:
+    """Benchmark every endpoint against one library size in the current process"""
+    workdir = tempfile.mkdtemp(prefix="video-bench-")
+    os.chdir(workdir)
+    data = generate_library(args.size, args.categories, seed=args.seed)
+    with open("videos.json", "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    file_bytes = os.path.getsize("videos.json")
+    samples = [
+        (category, videos[len(videos) // 2]["url"])
+        for category, videos in data.items()
+        if videos
+    ]
+    titles = [v["title"] for videos in data.values() for v in videos[:5]][:200]
+    del data
+
+    os.environ["VIDEO_STORE_BACKEND"] = args.backend
+    os.environ["VIDEO_STORE_DB"] = os.path.join(workdir, "videos.db")
+    os.environ["METADATA_CACHE_FILE"] = os.path.join(workdir, "metadata_cache.db")
+    os.environ["THUMBNAIL_CACHE_DIR"] = os.path.join(workdir, "thumbnails")
+    os.environ["TRACKED_PLAYLISTS_FILE"] = os.path.join(workdir, "playlists.db")
+    # The stub is only installed in this process
+    os.environ["EXTRACTION_EXECUTOR"] = "thread"
+    install_stub(args.latency, args.playlist_size)
+    warnings.filterwarnings("ignore")
+
+    from fastapi.testclient import TestClient
+
+    started = time.perf_counter()
+    import main
+
+    import_seconds = time.perf_counter() - started
+    main.thumbnail_cache.fetcher = stub_thumbnail
+    started = time.perf_counter()
+    with TestClient(main.app) as client:
+        load_seconds = time.perf_counter() - started
+        ctx = {
+            "client": client,
+            "categories": list(main.store.categories()),
+            "samples": samples,
+            "titles": titles,
+            "next_id": 2**41,
+        }
+        job = client.post(
+            "/playlists/convert",
+            params={
+                "playlist_url": "https://www.youtube.com/playlist?list=PLbench",
+                "background": "true",
+            },
+        ).json()
+        wait_for_job(client, job["job_id"])
+        ctx["job_id"] = job["job_id"]
+        ctx["playlist_file"] = client.get(f"/jobs/{job['job_id']}").json()["result"][
+            "filename"
+        ]
+        # A tracked playlist whose entries are already known
+        ctx["tracked_playlist"] = client.post(
+            "/playlists/tracked",
+            params={
+                "url": "https://www.youtube.com/playlist?list=PLtracked",
+                "category": ctx["categories"][0],
+            },
+        ).json()["playlist_id"]
+        client.post(f"/playlists/tracked/{ctx['tracked_playlist']}/sync")
+
+        endpoints = {}
+        for scenario in SCENARIOS:
+            if args.only and not any(name in scenario.name for name in args.only):
+                continue
+            iterations = args.slow_iterations if scenario.slow else args.iterations
+            endpoints[scenario.name] = run_scenario(
+                ctx, scenario, iterations, args.memory_iterations
+            )
+            print(f"  {scenario.name}: {endpoints[scenario.name]}", file=sys.stderr)
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "size": args.size,
+        "categories": args.categories,
+        "backend": args.backend,
+        "file_bytes": file_bytes,
+        "import_seconds": round(import_seconds, 3),
+        "load_seconds": round(load_seconds, 3),
+        "max_rss_bytes": max_rss_bytes(),
+        "endpoints": endpoints,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def worker_command(args, size: int, result_file: str) -> List[str]:
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "--worker",
+        "--size",
+        str(size),
+        "--result-file",
+        result_file,
+    ]
+    for option in (
+        "categories",
+        "backend",
+        "iterations",
+        "slow_iterations",
+        "memory_iterations",
+        "latency",
+        "playlist_size",
+        "seed",
+    ):
+        command += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+    for name in args.only or ():
+        command += ["--only", name]
+    return command
+
+
+def print_summary(runs: List[Dict]):
+    for run in runs:
+        print(
+            f"\n{run['size']} videos ({run['backend']}): imported in "
+            f"{run['import_seconds']}s, loaded in {run['load_seconds']}s, file {run['file_bytes'] / 1e6:.1f} MB, "
+            f"max RSS {(run['max_rss_bytes'] or 0) / 1e6:.0f} MB"
+        )
+        print(
+            f"  {'endpoint':<46} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'peak KB':>9}"
+        )
+        for name, stats in run["endpoints"].items():
+            print(
+                f"  {name:<46} {stats['throughput_rps']:>9} {stats['p50_ms']:>9} "
+                f"{stats['p99_ms']:>9} {stats['peak_memory_bytes'] // 1024:>9}"
+                + (f"  ({stats['errors']} errors)" if stats["errors"] else "")
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the API against synthetic libraries with a stubbed yt-dlp"
+    )
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="library sizes to run")
+    parser.add_argument("--categories", type=int, default=100)
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--slow-iterations", type=int, default=20)
+    parser.add_argument("--memory-iterations", type=int, default=3)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="seconds per stubbed extraction"
+    )
+    parser.add_argument("--playlist-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--only", action="append", help="run endpoints whose name contains this"
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    # Internal: benchmark one size in this process
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_size(args)
+        with open(args.result_file, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    # Each size runs in a fresh process so module state and peak RSS don't
+    # carry over from the previous one
+    runs = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        print(f"Benchmarking {size} videos...", file=sys.stderr)
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+            result_file = f.name
+        try:
+            subprocess.run(worker_command(args, size, result_file), check=True)
+            with open(result_file, "r", encoding="utf-8") as f:
+                runs.append(json.load(f))
+        finally:
+            os.remove(result_file)
+
+    results = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "settings": {
+            "categories": args.categories,
+            "backend": args.backend,
+            "iterations": args.iterations,
+            "slow_iterations": args.slow_iterations,
+            "latency": args.latency,
+            "playlist_size": args.playlist_size,
+            "seed": args.seed,
+        },
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print_summary(runs)
+    print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
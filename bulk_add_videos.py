@@ -1,15 +1,112 @@
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from store import canonical_url
 
 CATEGORIZED_FILE = "playlist_58353859-cfbc-4d37-9796-11877808c8fb_categorized.json"
-BASE_URL = "http://localhost:8000/categories/{}/videos/fetch?url={}"
+BATCH_URL = "http://localhost:8000/videos/batch"
+# Videos already added (or already present) are listed here, one JSON pair per
+# line, so an interrupted run picks up where it stopped
+PROGRESS_FILE = CATEGORIZED_FILE.replace(".json", ".progress")
+
+BATCH_SIZE = 50
+MAX_WORKERS = 4
+TIMEOUT = 600
+
+_progress_lock = threading.Lock()
+
+
+def load_done():
+    """Return the (category, canonical URL) pairs finished by earlier runs"""
+    if not os.path.exists(PROGRESS_FILE):
+        return set()
+    done = set()
+    with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                category, url = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line of a run that was killed mid-write
+                continue
+            # The server reports videos by their canonical URL, which may not
+            # be how the file spells them
+            done.add((category, canonical_url(url)))
+    return done
+
+
+def mark_done(pairs):
+    with _progress_lock, open(PROGRESS_FILE, "a", encoding="utf-8") as f:
+        for pair in pairs:
+            f.write(json.dumps(pair) + "\n")
+
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def post_batch(session, batch):
+    response = session.post(
+        BATCH_URL,
+        json={"items": [{"category": c, "url": u} for c, u in batch]},
+        timeout=TIMEOUT,
+    )
+    response.raise_for_status()
+    result = response.json()
+    # Only finished items are recorded; failed ones are retried next run
+    mark_done(
+        [r["category"], r["url"]]
+        for r in result["results"]
+        if r["status"] in ("added", "skipped")
+    )
+    return result
+
+
+def main():
+    with open(CATEGORIZED_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    done = load_done()
+    todo = [
+        (category, video["url"])
+        for category, videos in data["categories"].items()
+        for video in videos
+        if (category, canonical_url(video["url"])) not in done
+    ]
+    print(f"{len(done)} videos done in earlier runs, {len(todo)} to go")
+
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_maxsize=MAX_WORKERS))
+    session.mount("https://", HTTPAdapter(pool_maxsize=MAX_WORKERS))
+
+    totals = {"added": 0, "skipped": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(post_batch, session, batch)
+            for batch in chunks(todo, BATCH_SIZE)
+        ]
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except requests.RequestException as e:
+                print(f"Batch failed, it will be retried on the next run: {e}")
+                continue
+            for key in totals:
+                totals[key] += result[key]
+            for r in result["results"]:
+                if r["status"] == "failed":
+                    print(f"Failed {r['category']} {r['url']}: {r.get('error')}")
+            print(
+                f"POST {BATCH_URL} -> {result['message']} "
+                f"(total: {totals['added']} added, {totals['skipped']} skipped, "
+                f"{totals['failed']} failed)"
+            )
 
-with open(CATEGORIZED_FILE, "r", encoding="utf-8") as f:
-    data = json.load(f)
 
-for category, videos in data["categories"].items():
-    for video in videos:
-        url = video["url"]
-        endpoint = BASE_URL.format(category, url)
-        response = requests.post(endpoint)
-        print(f"POST {endpoint} -> {response.status_code}")
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 import json
+import multiprocessing
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 INPUT_FILE = "playlist_58353859-cfbc-4d37-9796-11877808c8fb_stripped.json"
 OUTPUT_FILE = "playlist_58353859-cfbc-4d37-9796-11877808c8fb_categorized.json"
@@ -50,13 +54,100 @@ CATEGORY_KEYWORDS = {
     "to_think": ["think", "singularity", "brain", "psychology", "philosophy", "debate", "question", "why", "what is"]
 }
 
-def categorize_video(title):
-    title_lower = title.lower()
-    for category, keywords in CATEGORY_KEYWORDS.items():
+def build_matcher(category_keywords):
+    """Compile all keywords into one whole-word pattern.
+
+    Returns (pattern, keyword -> categories). Longer keywords come first in
+    the alternation so "deep learning" wins over "deep".
+    """
+    keyword_categories = {}
+    for category, keywords in category_keywords.items():
         for kw in keywords:
-            if kw in title_lower:
-                return category
-    return None
+            keyword_categories.setdefault(kw.lower(), []).append(category)
+    alternation = "|".join(
+        re.escape(kw) for kw in sorted(keyword_categories, key=len, reverse=True)
+    )
+    pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)")
+    return pattern, keyword_categories
+
+KEYWORD_PATTERN, KEYWORD_CATEGORIES = build_matcher(CATEGORY_KEYWORDS)
+# Ties go to the category listed first, like the old first-match rule
+CATEGORY_PRIORITY = {category: idx for idx, category in enumerate(CATEGORY_KEYWORDS)}
+
+# Titles per worker task when categorizing in a process pool
+CHUNK_SIZE = 2000
+
+# Process pool shared by categorize_titles() calls, started on first use
+_pool = None
+_pool_lock = threading.Lock()
+
+def score_categories(title):
+    """Score every category against a title in one pass over it.
+
+    Each whole-word keyword hit adds its word count to the categories that
+    list it, so "machine learning" counts more than "ai".
+    """
+    scores = {}
+    for match in KEYWORD_PATTERN.finditer(title.lower()):
+        kw = match.group(0)
+        for category in KEYWORD_CATEGORIES[kw]:
+            scores[category] = scores.get(category, 0) + len(kw.split())
+    return scores
+
+def categorize_video(title):
+    scores = score_categories(title)
+    if not scores:
+        return None
+    return min(scores, key=lambda c: (-scores[c], CATEGORY_PRIORITY[c]))
+
+def _categorize_chunk(titles):
+    return [categorize_video(title) for title in titles]
+
+def _get_pool(processes=None):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Forking the threaded server could hand a worker a lock some
+            # other thread held at the time; start workers fresh instead
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+            else:
+                context = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=processes, mp_context=context)
+        return _pool
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+
+def shutdown_pool():
+    """Stop the process pool, if categorize_titles() started one"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+def categorize_titles(titles, processes=None):
+    """Categorize many titles, spreading large inputs over a process pool.
+
+    The pool is started by the first large input and reused after that, so
+    `processes` only applies to that first call. Stop it with shutdown_pool().
+    """
+    titles = list(titles)
+    if len(titles) <= CHUNK_SIZE:
+        return _categorize_chunk(titles)
+    chunks = [titles[i:i + CHUNK_SIZE] for i in range(0, len(titles), CHUNK_SIZE)]
+    pool = _get_pool(processes)
+    try:
+        results = pool.map(_categorize_chunk, chunks)
+        return [category for chunk in results for category in chunk]
+    except BrokenProcessPool:
+        # A worker died; the next call starts a fresh pool
+        _discard_pool(pool)
+        raise
 
 def main():
     with open(INPUT_FILE, "r", encoding="utf-8") as f:
@@ -65,9 +156,12 @@ def main():
     categorized = {cat: [] for cat in CATEGORIES}
     suggested_categories = {}
 
-    for video in data["videos"]:
-        title = video["title"]
-        category = categorize_video(title)
+    videos = data["videos"]
+    try:
+        categories = categorize_titles(video["title"] for video in videos)
+    finally:
+        shutdown_pool()
+    for video, category in zip(videos, categories):
         if category:
             categorized[category].append(video)
         else:
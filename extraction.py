@@ -0,0 +1,176 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+
+from metrics import Counter, Gauge, Histogram
+
+EXTRACTION_SECONDS = Histogram(
+    "extraction_seconds",
+    "Time yt-dlp extractions take once they start running",
+    ["function"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+EXTRACTIONS_IN_FLIGHT = Gauge(
+    "extractions_in_flight", "Extractions running in the pool right now"
+)
+EXTRACTIONS_WAITING = Gauge(
+    "extractions_waiting", "Extractions waiting for a free slot in the pool"
+)
+EXTRACTION_FAILURES = Counter(
+    "extraction_failures_total",
+    "Extractions that raised an error or timed out",
+    ["function", "reason"],
+)
+
+
+class ExtractionError(Exception):
+    """Raised when yt-dlp can't extract a video or playlist"""
+
+
+def _video_fields(info: Dict, url: str) -> Dict:
+    """Map a yt-dlp info dict to VideoInfo fields"""
+    return {
+        "title": info.get("title", ""),
+        "url": url,
+        "description": info.get("description", ""),
+        "duration": info.get("duration"),
+        "thumbnail": info.get("thumbnail"),
+        "view_count": info.get("view_count"),
+        "upload_date": info.get("upload_date"),
+        "channel": info.get("uploader"),
+        "watched": False,
+    }
+
+
+def extract_video(url: str) -> Union[Dict, List[Dict]]:
+    """Extract video or playlist information using yt-dlp.
+
+    Returns the fields of one video, or a list of them for a playlist.
+    """
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": False,  # Needed for full video info
+    }
+
+    # yt-dlp takes a while to import, so workers that never extract skip it
+    import yt_dlp
+
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+    except Exception as e:
+        raise ExtractionError(str(e))
+
+    # If it's a playlist, info['entries'] is a list of videos
+    if "entries" in info and isinstance(info["entries"], list):
+        return [
+            _video_fields(
+                entry,
+                (
+                    f"https://www.youtube.com/watch?v={entry['id']}"
+                    if entry.get("id")
+                    else url
+                ),
+            )
+            for entry in info["entries"]
+            if entry is not None
+        ]
+    return _video_fields(info, url)
+
+
+def extract_playlist(playlist_url: str) -> List[Dict]:
+    """Extract the fields of all videos in a playlist (flat listing)"""
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": True,
+    }
+
+    import yt_dlp
+
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            playlist_info = ydl.extract_info(playlist_url, download=False)
+        return [
+            _video_fields(entry, f"https://www.youtube.com/watch?v={entry['id']}")
+            for entry in playlist_info["entries"]
+        ]
+    except Exception as e:
+        raise ExtractionError(str(e))
+
+
+class ExtractionPool:
+    """Runs blocking yt-dlp calls off the event loop.
+
+    Work goes to a thread or process pool of `workers`. At most
+    `max_concurrent` extractions run at once; further callers wait their
+    turn without blocking the loop. An extraction that takes longer than
+    `timeout` seconds raises ExtractionError. A timed out thread can't be
+    interrupted, so its slot is only freed once it really finishes.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: int = 4,
+        max_concurrent: Optional[int] = None,
+        timeout: Optional[float] = 300,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.max_concurrent = max_concurrent or workers
+        self.timeout = timeout
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so forked workers don't inherit a pool
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="yt-dlp"
+                )
+        return self._executor
+
+    async def run(self, func, *args):
+        """Run func(*args) in the pool and return its result"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        semaphore = self._semaphore
+        with EXTRACTIONS_WAITING.track_inprogress():
+            await semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        name = getattr(func, "__name__", "unknown")
+        started = time.perf_counter()
+        try:
+            future = loop.run_in_executor(self._get_executor(), func, *args)
+        except BaseException:
+            semaphore.release()
+            raise
+        EXTRACTIONS_IN_FLIGHT.inc()
+
+        def finished(future):
+            semaphore.release()
+            EXTRACTIONS_IN_FLIGHT.dec()
+            EXTRACTION_SECONDS.observe(time.perf_counter() - started, function=name)
+            if not future.cancelled() and future.exception() is not None:
+                EXTRACTION_FAILURES.inc(function=name, reason="error")
+
+        future.add_done_callback(finished)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            EXTRACTION_FAILURES.inc(function=name, reason="timeout")
+            raise ExtractionError(f"Extraction timed out after {self.timeout}s")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class Job:
+    """A background fetch/convert job and its progress"""
+
+    def __init__(self, kind: str, params: Dict):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = QUEUED
+        self.phase: Optional[str] = None
+        self.total: Optional[int] = None
+        self.processed = 0
+        self.added = 0
+        self.skipped = 0
+        self.failed = 0
+        self.removed = 0
+        # One entry per processed video, in processing order
+        self.results: List[Dict] = []
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def record(self, outcome: str, title: Optional[str], url: Optional[str], **extra):
+        """Record one processed video.
+
+        outcome is "added", "skipped", "failed" or "removed" (gone from a
+        tracked playlist).
+        """
+        self.processed += 1
+        if outcome == "added":
+            self.added += 1
+        elif outcome == "skipped":
+            self.skipped += 1
+        elif outcome == "removed":
+            self.removed += 1
+        else:
+            self.failed += 1
+        self.results.append({"status": outcome, "title": title, "url": url, **extra})
+        self._notify()
+
+    def tally(self, added: int = 0, skipped: int = 0, failed: int = 0):
+        """Count processed videos without keeping a result for each.
+
+        For imports too large to list every video.
+        """
+        self.processed += added + skipped + failed
+        self.added += added
+        self.skipped += skipped
+        self.failed += failed
+        self._notify()
+
+    def set_phase(self, phase: str, total: Optional[int] = None):
+        self.phase = phase
+        if total is not None:
+            self.total = total
+        self._notify()
+
+    def _notify(self):
+        # Wake every waiter, then start a fresh event for the next change
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "phase": self.phase,
+            "progress": {
+                "total": self.total,
+                "processed": self.processed,
+                "added": self.added,
+                "skipped": self.skipped,
+                "failed": self.failed,
+                "removed": self.removed,
+            },
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    async def stream_results(self, offset: int = 0) -> AsyncIterator[str]:
+        """Yield results as NDJSON lines as they arrive, then the final summary"""
+        while True:
+            changed = self._changed
+            while offset < len(self.results):
+                yield json.dumps(self.results[offset]) + "\n"
+                offset += 1
+            if self.done:
+                yield json.dumps({"summary": self.summary()}) + "\n"
+                return
+            await changed.wait()
+
+
+class JobManager:
+    """Runs jobs in the background, at most `concurrency` at a time.
+
+    Only the last `history` finished jobs are kept.
+    """
+
+    def __init__(self, concurrency: int = 2, history: int = 100):
+        self.concurrency = concurrency
+        self.history = history
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def submit(self, kind: str, params: Dict, func) -> Job:
+        """Queue `await func(job)` and return the job right away"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        job = Job(kind, params)
+        self._jobs[job.id] = job
+        job._task = asyncio.create_task(self._run(job, func))
+        self._prune()
+        return job
+
+    async def _run(self, job: Job, func):
+        try:
+            async with self._semaphore:
+                job.status = RUNNING
+                job.started_at = datetime.now().isoformat()
+                job._notify()
+                job.result = await func(job)
+                job.status = COMPLETED
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+        except Exception as e:
+            job.status = FAILED
+            job.error = getattr(e, "detail", None) or str(e)
+        finally:
+            job.finished_at = datetime.now().isoformat()
+            job._notify()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. Returns False if it already finished"""
+        job = self._jobs[job_id]
+        if job.done:
+            return False
+        job._task.cancel()
+        return True
+
+    async def shutdown(self):
+        tasks = [job._task for job in self._jobs.values() if not job.done]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._semaphore = None